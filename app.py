@@ -6,9 +6,13 @@ sys.modules["sqlite3.dbapi2"] = sys.modules["pysqlite3.dbapi2"]
 import streamlit as st
 import pandas as pd
 from src.company_mca.crew import CompanyMcaCrew
-from src.company_mca.tools.custom_tool import mca_name_checker
+from src.company_mca.tools.custom_tool import mca_name_checker, rank_alternatives, warm_name_cache
+from src.company_mca.tools.prefetch import SpeculativePrefetcher, WarmBudget
+from src.company_mca.tools.normalization import live_feedback
+from src.company_mca.profiling import flame_nodes, list_captures, load_capture
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 import plotly.express as px
 import plotly.graph_objects as go
@@ -89,6 +93,12 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_prefetch_resources():
+    """Thread pool and warm-call budget shared by every session's prefetcher"""
+    executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mca-prefetch")
+    return executor, WarmBudget(per_minute=60, burst=40)
+
 def initialize_session_state():
     if 'results' not in st.session_state:
         st.session_state.results = None
@@ -98,6 +108,14 @@ def initialize_session_state():
         st.session_state.history = []
     if 'selected_name' not in st.session_state:
         st.session_state.selected_name = None
+    if 'prefetcher' not in st.session_state:
+        executor, budget = get_prefetch_resources()
+        st.session_state.prefetcher = SpeculativePrefetcher(
+            warm=warm_name_cache,
+            generate=generate_alternative_names,
+            executor=executor,
+            budget=budget
+        )
 
 def display_header():
     st.markdown("""
@@ -132,6 +150,15 @@ def display_name_card(name: str, status: str, details: Dict, index: int):
     
     return score
 
+def display_live_feedback(company_name: str):
+    feedback = live_feedback(company_name)
+    if feedback["errors"]:
+        st.caption(f"❌ {feedback['score']}/100 · {feedback['errors'][0]}")
+    elif feedback["warnings"]:
+        st.caption(f"⚠️ {feedback['score']}/100 · {feedback['warnings'][0]}")
+    else:
+        st.caption(f"✅ {feedback['score']}/100 · naming conventions look good")
+
 def check_single_name(company_name: str) -> Dict:
     try:
         with st.spinner(f"Checking '{company_name}'..."):
@@ -234,7 +261,11 @@ def process_company_names(original_name: str, check_alternatives: bool = True):
 
     if check_alternatives:
         st.write("💡 **Generating and checking alternatives...**")
-        alternatives = generate_alternative_names(original_name)
+        alternatives = (
+            st.session_state.prefetcher.alternatives_for(original_name)
+            or generate_alternative_names(original_name)
+        )
+        alternatives = rank_alternatives(alternatives)
         
         progress_bar = st.progress(0)
         for i, alt_name in enumerate(alternatives):
@@ -387,6 +418,26 @@ def display_sidebar():
         st.write("**Last Updated:** Real-time")
         st.write("**Data Source:** MCA Database")
     
+    captures = list_captures(limit=10)
+    if captures:
+        with st.sidebar.expander("🐢 Slow Captures"):
+            labels = {
+                f"{c['elapsed_ms'] / 1000:.1f}s · {c['label']} · {c['input']}": c["id"]
+                for c in captures
+            }
+            choice = st.selectbox("Capture", list(labels.keys()))
+            try:
+                capture = load_capture(labels[choice])
+            except (OSError, ValueError):
+                # Pruned by a slower capture since the list was read
+                capture = None
+                st.write("Capture no longer available")
+            if capture:
+                st.write(f"**Samples:** {capture['samples']} every {capture['interval_ms']}ms")
+                st.write(f"**Captured:** {capture['timestamp']}")
+                if st.button("Show flame graph"):
+                    st.session_state.flame_capture = capture
+    
     if st.session_state.history:
         st.sidebar.subheader("📈 Recent Searches")
         for i, entry in enumerate(st.session_state.history[-3:]):
@@ -410,10 +461,14 @@ def main():
             placeholder="e.g., Tech Innovations Pvt Ltd",
             help="Enter the company name you want to check for availability"
         )
+        if company_name:
+            display_live_feedback(company_name)
     
     with col2:
         st.write("")
         check_alternatives = st.checkbox("Generate alternatives", value=True)
+    
+    st.session_state.prefetcher.update(company_name, check_alternatives)
 
     col1, col2, col3 = st.columns([2, 2, 2])
     
@@ -447,6 +502,25 @@ def main():
         display_results(st.session_state.results)
     
 
+    if st.session_state.get("flame_capture"):
+        capture = st.session_state.flame_capture
+        st.markdown("---")
+        st.subheader(f"🔥 {capture['label']} '{capture['input']}' ({capture['elapsed_ms'] / 1000:.1f}s)")
+        nodes = flame_nodes(capture["stacks"])
+        fig = go.Figure(go.Icicle(
+            ids=nodes["ids"],
+            labels=nodes["labels"],
+            parents=nodes["parents"],
+            values=nodes["values"],
+            branchvalues="total",
+            tiling=dict(orientation="v", flip="y")
+        ))
+        fig.update_layout(height=600, margin=dict(t=10, l=10, r=10, b=10))
+        st.plotly_chart(fig, use_container_width=True)
+        if st.button("Close flame graph"):
+            st.session_state.flame_capture = None
+            st.rerun()
+    
     if st.session_state.selected_name:
         st.markdown("---")
         st.subheader("📋 Detailed Analysis")
@@ -1,19 +1,56 @@
 import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator
 from crewai import Agent, Task, Crew, Process
 from crewai.project import CrewBase, agent, crew, task
-from src.company_mca.tools.custom_tool import mca_name_checker
+from src.company_mca.tools.custom_tool import build_mca_name_checker, estimate_tokens
+from src.company_mca.profiling import profile_slow
 import yaml
 
 @CrewBase
 class CompanyMcaCrew():
-    def __init__(self):
+    def __init__(self, tool_output: str = None, validation_shards: int = None):
         self.agents_config = self._load_config('config/agents.yaml')
         self.tasks_config = self._load_config('config/tasks.yaml')
+        self.tool_output = tool_output
+        shard_config = self.tasks_config.get('validate_name_shard', {})
+        self.generated_names = shard_config.get('total_names', 30)
+        if validation_shards is None:
+            validation_shards = shard_config.get('shards', 1)
+        # More shards than names would leave shards with nothing to validate
+        self.validation_shards = max(1, min(validation_shards, self.generated_names))
+        self.last_run_stats = {}
+        self._tool_usage = {"calls": 0, "output_tokens": 0}
+        self._tool_usage_lock = threading.Lock()
+        self._check_observer = None
     
     def _load_config(self, file_path: str) -> dict:
         with open(file_path, 'r') as file:
             return yaml.safe_load(file)
     
+    def _name_checker_tool(self, config: dict):
+        """Build the MCA checker tool in the output format configured for the agent"""
+        return build_mca_name_checker(
+            output_format=self.tool_output or config.get('tool_output', 'full'),
+            max_conflicts=config.get('max_conflicts', 3),
+            on_result=self._record_tool_output
+        )
+    
+    def _record_tool_output(self, result: Dict[str, Any], output: Any):
+        """Tally checker calls and the estimated prompt tokens their output adds, then notify the streaming run"""
+        with self._tool_usage_lock:
+            self._tool_usage["calls"] += 1
+            self._tool_usage["output_tokens"] += estimate_tokens(str(output))
+        observer = self._check_observer
+        if observer is not None and "error" not in result:
+            observer(result)
+    
+    def _reset_tool_usage(self):
+        with self._tool_usage_lock:
+            self._tool_usage = {"calls": 0, "output_tokens": 0}
+    
     @agent
     def name_researcher(self) -> Agent:
         config = self.agents_config['name_researcher']
@@ -24,7 +61,7 @@ class CompanyMcaCrew():
             verbose=config['verbose'],
             allow_delegation=config['allow_delegation'],
             max_iter=config['max_iter'],
-            tools=[mca_name_checker]
+            tools=[self._name_checker_tool(config)]
         )
     
     @agent
@@ -37,7 +74,7 @@ class CompanyMcaCrew():
             verbose=config['verbose'],
             allow_delegation=config['allow_delegation'],
             max_iter=config['max_iter'],
-            tools=[mca_name_checker]
+            tools=[self._name_checker_tool(config)]
         )
     
     @agent
@@ -50,7 +87,33 @@ class CompanyMcaCrew():
             verbose=config['verbose'],
             allow_delegation=config['allow_delegation'],
             max_iter=config['max_iter'],
-            tools=[mca_name_checker]
+            tools=[self._name_checker_tool(config)]
+        )
+    
+    @agent
+    def name_curator(self) -> Agent:
+        config = self.agents_config['name_curator']
+        return Agent(
+            role=config['role'],
+            goal=config['goal'],
+            backstory=config['backstory'],
+            verbose=config['verbose'],
+            allow_delegation=config['allow_delegation'],
+            max_iter=config['max_iter'],
+            tools=[]
+        )
+    
+    def _shard_validator(self) -> Agent:
+        """Fresh validator agent per shard so async shard tasks never share executor state"""
+        config = self.agents_config['name_validator']
+        return Agent(
+            role=config['role'],
+            goal=config['goal'],
+            backstory=config['backstory'],
+            verbose=config['verbose'],
+            allow_delegation=config['allow_delegation'],
+            max_iter=config['max_iter'],
+            tools=[self._name_checker_tool(config)]
         )
     
     @task
@@ -82,14 +145,167 @@ class CompanyMcaCrew():
             context=[self.research_original_name(), self.generate_alternative_names()]
         )
     
+    def _validation_shard(self, shard: int) -> Task:
+        """Async task validating one contiguous slice of the generated names"""
+        config = self.tasks_config['validate_name_shard']
+        # Even split: with at most one shard per name every slice is non-empty
+        first = shard * self.generated_names // self.validation_shards + 1
+        last = (shard + 1) * self.generated_names // self.validation_shards
+        return Task(
+            description=config['description'].format(
+                shard=shard + 1, shards=self.validation_shards, first=first, last=last
+            ),
+            expected_output=config['expected_output'],
+            agent=self._shard_validator(),
+            context=[self.research_original_name(), self.generate_alternative_names()],
+            async_execution=True,
+            name=f"validate_name_shard_{shard + 1}"
+        )
+    
+    def _merge_validated_names(self, shards: list) -> Task:
+        config = self.tasks_config['merge_validated_names']
+        return Task(
+            description=config['description'],
+            expected_output=config['expected_output'],
+            agent=self.name_curator(),
+            context=shards,
+            name="merge_validated_names"
+        )
+    
+    def _pipeline_tasks(self) -> list:
+        """Sequential pipeline, with validation fanned out into parallel shards when configured"""
+        if self.validation_shards <= 1:
+            return [
+                self.research_original_name(),
+                self.generate_alternative_names(),
+                self.validate_name_availability()
+            ]
+        
+        shards = [self._validation_shard(i) for i in range(self.validation_shards)]
+        return [
+            self.research_original_name(),
+            self.generate_alternative_names(),
+            *shards,
+            self._merge_validated_names(shards)
+        ]
+    
     @crew
     def crew(self) -> Crew:
         """Create the crew"""
+        tasks = self._pipeline_tasks()
+        agents = list({id(task.agent): task.agent for task in tasks}.values())
         return Crew(
+            agents=agents,
+            tasks=tasks,
             process=Process.sequential,
             verbose=True
         )
     
+    @profile_slow("run_crew", all_threads=True)
     def run_crew(self, original_name: str) -> str:
+        start = time.perf_counter()
+        self._reset_tool_usage()
         result = self.crew().kickoff(inputs={"original_name": original_name})
-        return str(result)
\ No newline at end of file
+        self.last_run_stats = self._usage_stats(result, time.perf_counter() - start)
+        return str(result)
+    
+    def run_crew_stream(self, original_name: str) -> Iterator[Dict[str, Any]]:
+        """
+        Run the crew in a background thread and yield progress events as they happen.
+        
+        Event types: crew_started, task_started, tool_call, name_checked,
+        name_validated (an alternative that is available and compliant),
+        task_finished, crew_finished (with the final result and run stats) and error.
+        """
+        events = queue.Queue()
+        start = time.perf_counter()
+        
+        def emit(event_type: str, **fields):
+            events.put({"type": event_type, "elapsed": round(time.perf_counter() - start, 2), **fields})
+        
+        pipeline = self.crew()
+        self._reset_tool_usage()
+        started = set()
+        # Tasks and agents are memoized on this instance, so the stream's hooks
+        # are undone afterwards instead of feeding later runs into a dead queue
+        original_task_callbacks = [(pipeline_task, pipeline_task.callback) for pipeline_task in pipeline.tasks]
+        original_step_callbacks = {
+            id(pipeline_task.agent): (pipeline_task.agent, pipeline_task.agent.step_callback)
+            for pipeline_task in pipeline.tasks
+        }
+        for index, pipeline_task in enumerate(pipeline.tasks):
+            label = pipeline_task.name or f"task_{index + 1}"
+            
+            def on_step(step, label=label):
+                if label not in started:
+                    started.add(label)
+                    emit("task_started", task=label)
+                if getattr(step, 'tool', None):
+                    emit("tool_call", task=label, tool=step.tool, input=str(step.tool_input),
+                         output=str(getattr(step, 'result', ''))[:300])
+            
+            def on_task_done(output, label=label):
+                emit("task_finished", task=label, output=str(output))
+            
+            pipeline_task.agent.step_callback = on_step
+            pipeline_task.callback = on_task_done
+        
+        original_cleaned = original_name.strip().lower()
+        validated = set()
+        validated_lock = threading.Lock()
+        
+        def on_check(result: Dict[str, Any]):
+            emit("name_checked", name=result["name"], status_code=result.get("status_code"),
+                 score=result["validation"]["score"])
+            if not (result["is_available"] and result["validation"]["is_valid"]):
+                return
+            with validated_lock:
+                key = result["cleaned_name"]
+                if key in validated or result["name"].strip().lower() == original_cleaned:
+                    return
+                validated.add(key)
+            emit("name_validated", name=result["name"], score=result["validation"]["score"],
+                 recommendation=result["recommendation"])
+        
+        def run():
+            try:
+                result = pipeline.kickoff(inputs={"original_name": original_name})
+                self.last_run_stats = self._usage_stats(result, time.perf_counter() - start)
+                emit("crew_finished", result=str(result), stats=self.last_run_stats)
+            except Exception as e:
+                emit("error", error=str(e))
+            finally:
+                events.put(None)
+        
+        # Only this crew's own checker tools report here, so other runs and sessions never leak in
+        self._check_observer = on_check
+        try:
+            emit("crew_started", original_name=original_name,
+                 tasks=[pipeline_task.name for pipeline_task in pipeline.tasks])
+            threading.Thread(target=run, name="mca-crew", daemon=True).start()
+            while True:
+                event = events.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            if self._check_observer is on_check:
+                self._check_observer = None
+            for pipeline_task, callback in original_task_callbacks:
+                pipeline_task.callback = callback
+            for agent_instance, step_callback in original_step_callbacks.values():
+                agent_instance.step_callback = step_callback
+    
+    def _usage_stats(self, result, elapsed: float) -> dict:
+        """Prompt token and per-turn latency figures for comparing tool output formats"""
+        usage = getattr(result, 'token_usage', None)
+        requests = getattr(usage, 'successful_requests', 0) or 0
+        return {
+            "elapsed_seconds": round(elapsed, 2),
+            "prompt_tokens": getattr(usage, 'prompt_tokens', 0),
+            "completion_tokens": getattr(usage, 'completion_tokens', 0),
+            "llm_requests": requests,
+            "seconds_per_turn": round(elapsed / requests, 2) if requests else None,
+            "tool_calls": self._tool_usage["calls"],
+            "tool_output_tokens": self._tool_usage["output_tokens"]
+        }
\ No newline at end of file
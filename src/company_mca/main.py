@@ -8,20 +8,60 @@ import os
 from crew import CompanyMcaCrew
 import json
 
+def _pop_option(args: list, flag: str):
+    if flag not in args:
+        return None
+    index = args.index(flag)
+    value = args[index + 1] if index + 1 < len(args) else ""
+    del args[index:index + 2]
+    return value
+
+def _print_event(event: dict):
+    elapsed = f"[{event['elapsed']:>6.1f}s]"
+    if event["type"] == "task_started":
+        print(f"{elapsed} ▶ {event['task']}")
+    elif event["type"] == "tool_call":
+        print(f"{elapsed}   🔧 {event['tool']}: {event['input']}")
+    elif event["type"] == "name_validated":
+        print(f"{elapsed}   ✅ {event['name']} (score {event['score']})")
+    elif event["type"] == "task_finished":
+        print(f"{elapsed} ✔ {event['task']}")
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python main.py 'Company Name'")
+    args = sys.argv[1:]
+    stream = "--stream" in args
+    if stream:
+        args.remove("--stream")
+    tool_output = _pop_option(args, "--tool-output")
+    shards = _pop_option(args, "--shards")
+    
+    if not args or tool_output not in (None, "full", "compact") or (shards is not None and not (shards.isdigit() and int(shards) >= 1)):
+        print("Usage: python main.py 'Company Name' [--tool-output full|compact] [--shards N>=1] [--stream]")
         sys.exit(1)
     
-    original_name = sys.argv[1]
+    original_name = args[0]
     
     print(f"Checking availability for: {original_name}")
     
     try:
-        crew = CompanyMcaCrew()
-        result = crew.run_crew(original_name)
+        crew = CompanyMcaCrew(
+            tool_output=tool_output,
+            validation_shards=int(shards) if shards is not None else None
+        )
+        if stream:
+            result = None
+            for event in crew.run_crew_stream(original_name):
+                if event["type"] == "error":
+                    raise RuntimeError(event["error"])
+                if event["type"] == "crew_finished":
+                    result = event["result"]
+                _print_event(event)
+        else:
+            result = crew.run_crew(original_name)
         print("\nResults:")
         print(result)
+        print("\nRun stats:")
+        print(json.dumps(crew.last_run_stats, indent=2))
         
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -0,0 +1,215 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+
+def profile_dir() -> str:
+    return os.getenv('MCA_PROFILE_DIR', '.mca_profiles')
+
+def threshold_ms(label: str) -> Optional[float]:
+    """
+    Latency above which a call is captured, or None when profiling is off.
+
+    MCA_PROFILE_THRESHOLD_MS_<LABEL> overrides MCA_PROFILE_THRESHOLD_MS for one
+    label, e.g. MCA_PROFILE_THRESHOLD_MS_RUN_CREW=120000.
+    """
+    value = os.getenv(f'MCA_PROFILE_THRESHOLD_MS_{label.upper()}') or os.getenv('MCA_PROFILE_THRESHOLD_MS')
+    return float(value) if value else None
+
+class SamplingProfiler:
+    """Background thread recording collapsed call stacks of one thread (or all) at a fixed interval"""
+
+    def __init__(self, thread_id: int = None, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="mca-profiler", daemon=True)
+
+    def start(self) -> "SamplingProfiler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self):
+        names = {}
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            if self.thread_id is not None:
+                frames = {self.thread_id: frames[self.thread_id]} if self.thread_id in frames else {}
+            else:
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if self.thread_id is None:
+                    stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+def _save_capture(label: str, input_name: str, elapsed_ms: float, profiler: SamplingProfiler):
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    capture_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    capture = {
+        "id": capture_id,
+        "label": label,
+        "input": input_name,
+        "elapsed_ms": round(elapsed_ms, 1),
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "interval_ms": profiler.interval * 1000,
+        "samples": profiler.samples,
+        "stacks": dict(profiler.stacks)
+    }
+    # Write under a temporary name and rename, so readers never see a partial file
+    temporary_path = os.path.join(directory, f".{capture_id}.tmp")
+    with open(temporary_path, 'w') as file:
+        json.dump(capture, file)
+    os.replace(temporary_path, os.path.join(directory, f"{capture_id}.json"))
+    _prune(int(os.getenv('MCA_PROFILE_KEEP', '50')))
+
+def _prune(keep: int):
+    """Keep only the ``keep`` slowest captures"""
+    for capture in list_captures()[keep:]:
+        try:
+            os.remove(os.path.join(profile_dir(), f"{capture['id']}.json"))
+        except FileNotFoundError:
+            # Another thread or process pruned it first
+            pass
+
+def profile_slow(label: str, name_arg: int = 1, all_threads: bool = False):
+    """
+    Decorator capturing a sampling profile whenever the call exceeds the threshold.
+
+    ``name_arg`` is the positional index of the input name (1 skips ``self``).
+    With ``all_threads`` every thread is sampled, which covers async crew tasks
+    and tool calls running off the caller's thread.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            threshold = threshold_ms(label)
+            if threshold is None:
+                return func(*args, **kwargs)
+
+            interval = float(os.getenv('MCA_PROFILE_INTERVAL_MS', '5')) / 1000
+            profiler = SamplingProfiler(None if all_threads else threading.get_ident(), interval).start()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                profiler.stop()
+                if elapsed_ms >= threshold:
+                    input_name = args[name_arg] if len(args) > name_arg else ""
+                    try:
+                        _save_capture(label, str(input_name), elapsed_ms, profiler)
+                    except Exception as e:
+                        # Profiling must never change the outcome of the call it observes
+                        print(f"Profile capture failed: {e}")
+        return wrapper
+    return decorator
+
+def list_captures(limit: int = None) -> List[Dict]:
+    """Stored captures, slowest first, without their stacks; files pruned or unreadable mid-scan are skipped"""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    captures = []
+    for file_name in os.listdir(directory):
+        if file_name.endswith('.json'):
+            try:
+                capture = load_capture(file_name[:-5])
+            except (OSError, ValueError):
+                continue
+            if not isinstance(capture, dict) or "elapsed_ms" not in capture:
+                continue
+            capture.pop("stacks", None)
+            captures.append(capture)
+    captures.sort(key=lambda capture: capture["elapsed_ms"], reverse=True)
+    return captures[:limit] if limit else captures
+
+def load_capture(capture_id: str) -> Dict:
+    with open(os.path.join(profile_dir(), f"{capture_id}.json"), 'r') as file:
+        return json.load(file)
+
+def flame_nodes(stacks: Dict[str, int]) -> Dict[str, List]:
+    """Flatten collapsed stacks into ids/labels/parents/values for a plotly icicle flame graph"""
+    totals = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        for depth in range(1, len(frames) + 1):
+            totals[";".join(frames[:depth])] += count
+
+    nodes = {"ids": [], "labels": [], "parents": [], "values": []}
+    for node_id, value in totals.items():
+        parent, _, label = node_id.rpartition(";")
+        nodes["ids"].append(node_id)
+        nodes["labels"].append(label)
+        nodes["parents"].append(parent)
+        nodes["values"].append(value)
+    return nodes
+
+def render_text_flame(stacks: Dict[str, int], min_share: float = 0.01, width: int = 40) -> str:
+    """Indented call tree with inclusive sample bars, for terminals"""
+    nodes = flame_nodes(stacks)
+    total = sum(stacks.values()) or 1
+    children = {}
+    for node_id, parent, value in zip(nodes["ids"], nodes["parents"], nodes["values"]):
+        children.setdefault(parent, []).append((value, node_id))
+
+    lines = []
+    def walk(parent: str, depth: int):
+        for value, node_id in sorted(children.get(parent, []), reverse=True):
+            share = value / total
+            if share < min_share:
+                continue
+            bar = "█" * max(1, int(share * width))
+            lines.append(f"{share * 100:5.1f}% {bar:<{width}} {'  ' * depth}{node_id.rpartition(';')[2]}")
+            walk(node_id, depth + 1)
+    walk("", 0)
+    return "\n".join(lines)
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ("list", "show", "collapsed"):
+        print("Usage: python -m src.company_mca.profiling list [N] | show <id> | collapsed <id>")
+        sys.exit(1)
+
+    if args[0] == "list":
+        for capture in list_captures(int(args[1]) if len(args) > 1 else 20):
+            print(f"{capture['id']}  {capture['elapsed_ms']:>10.1f}ms  {capture['label']:<12} {capture['input']}")
+        return
+
+    if len(args) < 2:
+        print(f"Usage: python -m src.company_mca.profiling {args[0]} <id>")
+        sys.exit(1)
+
+    capture = load_capture(args[1])
+    if args[0] == "collapsed":
+        # Brendan Gregg's folded format, for flamegraph.pl or speedscope
+        for stack, count in capture["stacks"].items():
+            print(f"{stack} {count}")
+    else:
+        print(f"{capture['label']} '{capture['input']}' took {capture['elapsed_ms']}ms "
+              f"({capture['samples']} samples every {capture['interval_ms']}ms)")
+        print(render_text_flame(capture["stacks"]))
+
+if __name__ == "__main__":
+    main()
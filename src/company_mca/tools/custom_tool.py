@@ -1,4 +1,3 @@
-import requests
 import json
 from typing import Dict, List, Any
 from crewai.tools import tool
@@ -7,6 +6,16 @@ import random
 from fuzzywuzzy import fuzz
 import re
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from src.company_mca.profiling import profile_slow
+from src.company_mca.tools.finanvo_scheduler import FinanvoScheduler, get_default_scheduler
+from src.company_mca.tools.synthetic_registry import SyntheticRegistry, get_default_registry
+from src.company_mca.tools.spelling_index import DeletionIndex
+from src.company_mca.tools.phonetic_index import PhoneticIndex
+from src.company_mca.tools.similarity_engine import NGramSimilarityEngine
+from src.company_mca.tools.normalization import clean_company_name, validate_naming_conventions
 
 @tool("MCA Name Checker")
 def mca_name_checker(company_name: str) -> Dict[str, Any]:
@@ -20,8 +29,7 @@ def mca_name_checker(company_name: str) -> Dict[str, Any]:
         Dictionary containing availability status, validation results, and recommendations
     """
     try:
-        checker = MCANameChecker()
-        return checker.check_name(company_name)
+        return mca_checker_instance.check_name(company_name)
     except Exception as e:
         return {
             "error": str(e),
@@ -29,30 +37,158 @@ def mca_name_checker(company_name: str) -> Dict[str, Any]:
             "is_available": False
         }
 
+def build_mca_name_checker(output_format: str = "full", max_conflicts: int = 3, on_result=None):
+    """
+    Return the MCA name checker tool configured for an agent.
+
+    "full" returns the dictionary tool, "compact" a tool that answers with a
+    single terse line, keeping agent prompts small across the many validation
+    calls of a crew run. ``on_result(result, output)`` is called after every
+    check with the check_name result and the output handed to the agent.
+    """
+    if output_format not in ("full", "compact"):
+        raise ValueError(f"Unknown tool output format: {output_format}")
+    if output_format == "full" and on_result is None:
+        return mca_name_checker
+
+    def observed(output, result):
+        if on_result is not None:
+            on_result(result, output)
+        return output
+
+    if output_format == "full":
+        @tool("MCA Name Checker")
+        def mca_name_checker_observed(company_name: str) -> Dict[str, Any]:
+            """
+            Check company name availability through Finanvo API and validate naming conventions.
+
+            Args:
+                company_name: The company name to check for availability
+
+            Returns:
+                Dictionary containing availability status, validation results, and recommendations
+            """
+            try:
+                result = mca_checker_instance.check_name(company_name)
+            except Exception as e:
+                result = {"error": str(e), "name": company_name, "is_available": False}
+            return observed(result, result)
+
+        return mca_name_checker_observed
+
+    @tool("MCA Name Checker")
+    def mca_name_checker_compact(company_name: str) -> str:
+        """
+        Check company name availability through Finanvo API and validate naming conventions.
+
+        Args:
+            company_name: The company name to check for availability
+
+        Returns:
+            One line "name|status|avail|score|conflicts|issues" where status is
+            OK, WARN, SIMILAR, EXACT, INVALID or ERR; avail is Y/N; conflicts are
+            "registered name=similarity%" joined by ";"; issues are short codes
+            (SUFFIX, CHARS, DIGIT, SHORT, LONG, BAN:<word>, SPACES, TRIM, WORDY,
+            SOUNDS:<registered name> for a sound-alike that is not a conflict).
+        """
+        try:
+            result = mca_checker_instance.check_name(company_name)
+        except Exception as e:
+            result = {"error": str(e), "name": company_name, "is_available": False}
+        return observed(format_compact_result(result, max_conflicts), result)
+
+    return mca_name_checker_compact
+
+ISSUE_CODES = [
+    ("Company name too short", "SHORT"),
+    ("Company name too long", "LONG"),
+    ("Company name must end with proper suffix", "SUFFIX"),
+    ("Invalid characters found", "CHARS"),
+    ("Company name cannot start with a number", "DIGIT"),
+    ("Multiple consecutive spaces found", "SPACES"),
+    ("Leading or trailing spaces detected", "TRIM"),
+    ("Very long names may face scrutiny", "WORDY"),
+]
+
+def _issue_code(message: str) -> str:
+    match = re.match(r"Prohibited word '(.+)' found", message)
+    if match:
+        return f"BAN:{match.group(1)}"
+    for prefix, code in ISSUE_CODES:
+        if message.startswith(prefix):
+            return code
+    return message
+
+def format_compact_result(result: Dict[str, Any], max_conflicts: int = 3) -> str:
+    """Render a check_name result as one "name|status|avail|score|conflicts|issues" line"""
+    name = result.get("name", "")
+    if "error" in result:
+        return f"{name}|ERR|N|0||{result['error']}"
+
+    validation = result.get("validation", {})
+    conflicts = ";".join(
+        f"{company.get('company_name', '')}={company.get('similarity', 0)}"
+        for company in result.get("existing_companies", [])[:max_conflicts]
+    )
+    issues = ",".join(
+        [_issue_code(message) for message in validation.get("errors", []) + validation.get("warnings", [])]
+        + [f"SOUNDS:{company.get('company_name', '')}" for company in result.get("sound_alike_companies", [])[:max_conflicts]]
+    )
+    available = "Y" if result.get("is_available") else "N"
+    return f"{name}|{result.get('status_code', '')}|{available}|{validation.get('score', 0)}|{conflicts}|{issues}"
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt-token estimate (~4 characters per token) for tool output sizing"""
+    return max(1, len(text) // 4)
+
 class MCANameChecker:
-    def __init__(self):
+    def __init__(self, scheduler: FinanvoScheduler = None, registry: SyntheticRegistry = None, offline: bool = None,
+                 spelling_index: DeletionIndex = None, phonetic_index: PhoneticIndex = None,
+                 similarity_engine: NGramSimilarityEngine = None):
         self.base_url = "https://api.finanvo.in"
         self.headers = {
-            'Content-Type': 'application/json',
-            'x-api-key': 'be2SxiTi',
-            'x-api-secret-key': '0oOwfzhylxtH7OZZA9GuBc5cyGOCrqEqSixOuV'
+            'Content-Type': 'application/json'
         }
+        self.scheduler = scheduler or get_default_scheduler()
+        self.registry = registry or get_default_registry()
+        self.offline = offline if offline is not None else os.getenv('MCA_OFFLINE', '').lower() in ('1', 'true', 'yes')
+        if not self.offline and not self.scheduler.credentials:
+            print("Warning: no Finanvo credentials configured (set FINANVO_API_KEY and FINANVO_API_SECRET). "
+                  "Searching the synthetic registry instead.")
+            self.offline = True
+        self.spelling_index = spelling_index or DeletionIndex()
+        self.phonetic_index = phonetic_index or PhoneticIndex()
+        self.similarity_engine = similarity_engine or NGramSimilarityEngine()
+        self._known_companies = set()
+        self._registry_indexed = False
+        self._index_lock = threading.Lock()
+        self._registry_index_lock = threading.Lock()
+        self.local_index_size = int(os.getenv('MCA_LOCAL_INDEX_SIZE', '20000'))
+        self.search_cache_ttl = float(os.getenv('MCA_SEARCH_CACHE_TTL', '600'))
+        self.search_cache_size = 2048
+        self._search_cache = OrderedDict()
+        self._search_cache_lock = threading.Lock()
+        self._search_in_flight: Dict[str, Future] = {}
         self.run_applications = {}
     
+    @profile_slow("check_name")
     def check_name(self, company_name: str) -> Dict[str, Any]:
         try:
             cleaned_name = self._clean_company_name(company_name)
             availability_result = self._check_company_existence(cleaned_name)
             validation_result = self._validate_naming_conventions(company_name)
             
-            return {
+            result = {
                 "name": company_name,
                 "cleaned_name": cleaned_name,
                 "is_available": availability_result["available"],
                 "existing_companies": availability_result["existing_companies"],
+                "sound_alike_companies": availability_result.get("sound_alikes", []),
                 "validation": validation_result,
+                "status_code": self._get_status_code(availability_result, validation_result),
                 "recommendation": self._get_recommendation(availability_result, validation_result)
             }
+            return result
             
         except Exception as e:
             return {
@@ -63,19 +199,71 @@ class MCANameChecker:
     
     def _clean_company_name(self, name: str) -> str:
         """Clean company name by removing suffixes and special characters"""
-        suffixes = ['pvt ltd', 'private limited', 'ltd', 'limited', 'pvt', 'private']
-        cleaned = name.lower()
-        
-        for suffix in suffixes:
-            if cleaned.endswith(suffix):
-                cleaned = cleaned[:-len(suffix)].strip()
-        
-        cleaned = re.sub(r'[^a-zA-Z0-9\s]', '', cleaned)
-        return cleaned.strip()
+        return clean_company_name(name)
+    
+    def _cached_search(self, search_term: str):
+        with self._search_cache_lock:
+            entry = self._search_cache.get(search_term)
+            if entry is None or time.time() - entry[0] > self.search_cache_ttl:
+                return None
+            self._search_cache.move_to_end(search_term)
+            return [dict(company) for company in entry[1]]
+    
+    def _store_search(self, search_term: str, companies: List[Dict]):
+        with self._search_cache_lock:
+            self._search_cache[search_term] = (time.time(), [dict(company) for company in companies])
+            self._search_cache.move_to_end(search_term)
+            while len(self._search_cache) > self.search_cache_size:
+                self._search_cache.popitem(last=False)
+    
+    def warm_cache(self, company_name: str) -> None:
+        """Run the remote search for a name ahead of time so a later check_name hits the cache"""
+        self._search_companies_by_name(self._clean_company_name(company_name))
     
     def _search_companies_by_name(self, search_term: str) -> List[Dict]:
+        """
+        Cached search; concurrent callers for the same term (e.g. a prefetch
+        warm and a "Check Name" run) share one request instead of each
+        spending API quota.
+        """
+        found_companies = self._cached_search(search_term)
+        if found_companies is not None:
+            return found_companies
+
+        with self._search_cache_lock:
+            in_flight = self._search_in_flight.get(search_term)
+            if in_flight is None:
+                in_flight = self._search_in_flight[search_term] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return [dict(company) for company in in_flight.result()]
+
+        try:
+            found_companies = self._fetch_companies_by_name(search_term)
+            in_flight.set_result([dict(company) for company in found_companies])
+            return found_companies
+        except Exception as e:
+            in_flight.set_exception(e)
+            raise
+        finally:
+            with self._search_cache_lock:
+                self._search_in_flight.pop(search_term, None)
+    
+    def _fetch_companies_by_name(self, search_term: str) -> List[Dict]:
+        # A caller that finished while this one waited for the in-flight slot
+        found_companies = self._cached_search(search_term)
+        if found_companies is not None:
+            return found_companies
         found_companies = []
         
+        if self.offline:
+            found_companies = self.registry.search(search_term, limit=10)
+            self.index_registered_names(found_companies)
+            self._store_search(search_term, found_companies)
+            return found_companies
+        
         try:
             url = f"{self.base_url}/company/search"
             params = {
@@ -83,7 +271,7 @@ class MCANameChecker:
                 "limit": 10
             }
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = self.scheduler.get(url, headers=self.headers, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -96,7 +284,11 @@ class MCANameChecker:
                             "similarity": fuzz.ratio(search_term.lower(), 
                                                    company.get("company_name", "").lower())
                         })
+                # Only real register entries feed the local indexes, never mock fallbacks
+                self.index_registered_names(found_companies)
+                self._store_search(search_term, found_companies)
             else:
+                print(f"API returned {response.status_code}. Using mock data.")
                 found_companies = self._mock_company_search(search_term)
                 
         except Exception as e:
@@ -106,51 +298,108 @@ class MCANameChecker:
         return found_companies
     
     def _mock_company_search(self, name: str) -> List[Dict]:
-        common_businesses = [
-            "solutions", "systems", "services", "technologies", "enterprises",
-            "consulting", "digital", "software", "innovations", "labs",
-            "ventures", "industries", "corporation", "holdings", "group"
-        ]
-        
-        locations = ["Delhi", "Mumbai", "Bangalore", "Chennai", "Hyderabad", "Pune"]
-        
-        name_lower = name.lower()
-        conflicts = []
-        words = name_lower.split()
-        
-        for i in range(random.randint(0, 4)):
-            if words:
-                base_word = random.choice(words)
-                business_type = random.choice(common_businesses)
-                location = random.choice(locations)
-                patterns = [
-                    f"{base_word.title()} {business_type.title()} Private Limited",
-                    f"{base_word.title()} {business_type.title()} Pvt Ltd",
-                    f"New {base_word.title()} {business_type.title()} Limited",
-                    f"{base_word.title()} {location} {business_type.title()} Pvt Ltd",
-                    f"Global {base_word.title()} {business_type.title()} Private Limited"
-                ]
-                
-                conflict_name = random.choice(patterns)
-                similarity = fuzz.ratio(name_lower, conflict_name.lower())
-                if similarity > 30:
-                    conflicts.append({
-                        "company_name": conflict_name,
-                        "cin": f"U{random.randint(10000, 99999)}{random.choice(['DL', 'MH', 'KA'])}{random.randint(2010, 2023)}PTC{random.randint(100000, 999999)}",
-                        "status": random.choice(["Active", "Inactive", "Struck Off"]),
-                        "similarity": similarity
-                    })
-        
-        conflicts.sort(key=lambda x: x["similarity"], reverse=True)
-        
-        return conflicts[:3]
+        """Deterministic fallback: the same name always yields the same conflicts"""
+        return self.registry.search(name, limit=3)
+    
+    def index_registered_names(self, companies) -> None:
+        """Add registered companies (dicts with company_name, cin, status) to the local name indexes"""
+        with self._index_lock:
+            new_records = []
+            for company in companies:
+                key = company.get("cin") or company.get("company_name", "")
+                if not key or key in self._known_companies:
+                    continue
+                self._known_companies.add(key)
+                record = {
+                    "company_name": company.get("company_name", ""),
+                    "cin": company.get("cin", ""),
+                    "status": company.get("status", "")
+                }
+                cleaned = self._clean_company_name(record["company_name"])
+                self.spelling_index.add(cleaned, record)
+                self.phonetic_index.add(cleaned, record)
+                new_records.append((cleaned, record))
+            self.similarity_engine.add_many(new_records)
+    
+    def build_local_indexes(self, limit: int = None) -> None:
+        """
+        Preload the first ``limit`` synthetic registry records (default
+        MCA_LOCAL_INDEX_SIZE, 20,000) into the local name indexes, once.
+
+        Indexing the whole 100k registry takes seconds and hundreds of MB, so
+        only a capped slice is preloaded; names found by later searches are
+        added as they come.
+        """
+        with self._registry_index_lock:
+            if self._registry_indexed:
+                return
+            limit = self.local_index_size if limit is None else limit
+            if limit > 0:
+                self.index_registered_names(self.registry.records(0, limit))
+            self._registry_indexed = True
+    
+    def _ensure_registry_indexed(self) -> None:
+        """In offline mode the synthetic registry is the register, so preload it before the first lookup"""
+        if self.offline:
+            self.build_local_indexes()
+    
+    def _spelling_candidates(self, name: str) -> List[Dict]:
+        """Registered names within edit distance 1 (short names) or 2 of the cleaned name"""
+        self._ensure_registry_indexed()
+        max_distance = 1 if len(name) < 8 else 2
+        candidates = []
+        for _, distance, records in self.spelling_index.lookup(name, max_distance):
+            for record in records:
+                candidates.append({**record, "match_type": "spelling", "edit_distance": distance})
+        return candidates
+    
+    def _phonetic_candidates(self, name: str) -> List[Dict]:
+        """Registered names that sound like the cleaned name: full when every word matches in order, otherwise partial"""
+        self._ensure_registry_indexed()
+        candidates = []
+        for _, full_match, records in self.phonetic_index.lookup(name):
+            for record in records:
+                candidates.append({**record, "match_type": "phonetic", "phonetic_match": "full" if full_match else "partial"})
+        return candidates
+    
+    def _ngram_candidates(self, name: str, k: int = 5) -> List[Dict]:
+        """Closest registered names by character n-gram TF-IDF cosine similarity"""
+        self._ensure_registry_indexed()
+        candidates = []
+        for _, score, records in self.similarity_engine.top_k([name], k=k, min_score=0.6)[0]:
+            for record in records:
+                candidates.append({**record, "match_type": "ngram", "ngram_score": round(score, 3)})
+        return candidates
+    
+    def rank_alternatives(self, names: List[str]) -> List[str]:
+        """Order names least-conflicting first, scoring the whole batch in one TF-IDF query"""
+        self._ensure_registry_indexed()
+        cleaned = [self._clean_company_name(name) for name in names]
+        neighbours = self.similarity_engine.top_k(cleaned, k=1)
+        closest = [hits[0][1] if hits else 0.0 for hits in neighbours]
+        order = sorted(range(len(names)), key=lambda i: closest[i])
+        return [names[i] for i in order]
     
     def _check_company_existence(self, name: str) -> Dict[str, Any]:
         try:
             existing_companies = self._search_companies_by_name(name)
             
+            seen = {company.get("cin") or company.get("company_name") for company in existing_companies}
+            local_candidates = (
+                self._spelling_candidates(name)
+                + self._phonetic_candidates(name)
+                + self._ngram_candidates(name)
+            )
+            for company in local_candidates:
+                key = company.get("cin") or company.get("company_name")
+                if key in seen:
+                    continue
+                seen.add(key)
+                existing_companies.append(company)
+            
             exact_matches = []
             similar_companies = []
+            sound_alikes = []
             
             for company in existing_companies:
                 company_name = company.get("company_name", "").lower()
@@ -158,18 +407,24 @@ class MCANameChecker:
                 
                 similarity = fuzz.ratio(name.lower(), cleaned_existing)
                 
-                if similarity > 95:
+                if similarity > 95 or company.get("edit_distance") == 0:
                     exact_matches.append(company)
-                elif similarity > 70:
+                elif similarity > 70 or company.get("match_type") == "spelling" or (
+                        company.get("match_type") == "phonetic" and company.get("phonetic_match") == "full"):
                     company["similarity"] = similarity
                     similar_companies.append(company)
+                elif company.get("match_type") == "phonetic":
+                    company["similarity"] = similarity
+                    sound_alikes.append(company)
 
             similar_companies.sort(key=lambda x: x.get("similarity", 0), reverse=True)
+            sound_alikes.sort(key=lambda x: x.get("similarity", 0), reverse=True)
             
             return {
                 "available": len(exact_matches) == 0 and len(similar_companies) == 0,
                 "exact_matches": exact_matches,
                 "existing_companies": similar_companies[:5],
+                "sound_alikes": sound_alikes[:5],
                 "total_found": len(existing_companies)
             }
             
@@ -181,61 +436,7 @@ class MCANameChecker:
             }
     
     def _validate_naming_conventions(self, name: str) -> Dict[str, Any]:
-        errors = []
-        warnings = []
-        if len(name) < 3:
-            errors.append("Company name too short (minimum 3 characters)")
-        elif len(name) > 120:
-            errors.append("Company name too long (maximum 120 characters)")
-        
-        prohibited_words = [
-            'bank', 'banking', 'insurance', 'government', 'ministry', 'national', 
-            'central', 'reserve', 'federal', 'authority', 'commission', 
-            'corporation of india', 'registrar', 'co-operative', 'municipal', 
-            'panchayat', 'king', 'queen', 'emperor', 'prince', 'princess',
-            'supreme', 'tribunal', 'court', 'university', 'college',
-            'trust', 'society', 'foundation', 'council'
-        ]
-        
-        name_lower = name.lower()
-        for word in prohibited_words:
-            if word in name_lower:
-                errors.append(f"Prohibited word '{word}' found in name")
-
-        valid_suffixes = [
-            'pvt ltd', 'private limited', 'pvt. ltd.', 'private limited.',
-            'limited', 'ltd', 'ltd.'
-        ]
-        
-        has_valid_suffix = any(name.lower().endswith(suffix) for suffix in valid_suffixes)
-        if not has_valid_suffix:
-            errors.append("Company name must end with proper suffix (Pvt Ltd or Private Limited)")
-        if re.search(r'[^a-zA-Z0-9\s\.\-&()]', name):
-            errors.append("Invalid characters found (only letters, numbers, spaces, dots, hyphens, ampersands, and parentheses allowed)")
-        if re.search(r'^\d', name):
-            errors.append("Company name cannot start with a number")
-        if re.search(r'\s{2,}', name):
-            warnings.append("Multiple consecutive spaces found")
-        
-        if name != name.strip():
-            warnings.append("Leading or trailing spaces detected")
-        words = name.split()
-        if len(words) > 15:
-            warnings.append("Very long names may face scrutiny during approval")
-
-        base_score = 100
-        base_score -= len(errors) * 25  
-        base_score -= len(warnings) * 5
-        if has_valid_suffix:
-            base_score += 5
-        if 3 <= len(words) <= 5:
-            base_score += 5
-        return {
-            "is_valid": len(errors) == 0,
-            "errors": errors,
-            "warnings": warnings,
-            "score": max(0, min(100, base_score))
-        }
+        return validate_naming_conventions(name)
         
     def _get_recommendation(self, availability: Dict, validation: Dict) -> str:
         if not availability["available"]:
@@ -249,12 +450,32 @@ class MCANameChecker:
             error_count = len(validation["errors"])
             return f"❌ Name validation failed - {error_count} naming convention errors"
         
+        if availability.get("sound_alikes"):
+            sound_alike_count = len(availability["sound_alikes"])
+            return f"⚠️ Name available but sounds like {sound_alike_count} registered companies"
+        
         if validation["warnings"]:
             warning_count = len(validation["warnings"])
             return f"⚠️ Name available with minor issues - {warning_count} warnings to consider"
         
         return "✅ Name appears available and compliant with MCA guidelines"
 
+    def _get_status_code(self, availability: Dict, validation: Dict) -> str:
+        """Short code mirroring _get_recommendation, used by the compact tool output"""
+        if not availability["available"]:
+            if availability.get("exact_matches"):
+                return "EXACT"
+            elif availability.get("existing_companies"):
+                return "SIMILAR"
+
+        if not validation["is_valid"]:
+            return "INVALID"
+
+        if validation["warnings"] or availability.get("sound_alikes"):
+            return "WARN"
+
+        return "OK"
+
 mca_checker_instance = MCANameChecker()
 
 '''
@@ -289,12 +510,17 @@ def get_name_suggestions(base_name: str, count: int = 5) -> List[str]:
     
     return suggestions
 
+def rank_alternatives(names: List[str]) -> List[str]:
+    return mca_checker_instance.rank_alternatives(names)
+
+def warm_name_cache(company_name: str) -> None:
+    mca_checker_instance.warm_cache(company_name)
+
 def batch_check_names(company_names: List[str]) -> List[Dict[str, Any]]:
     results = []
-    checker = MCANameChecker()
     
     for name in company_names:
-        result = checker.check_name(name)
+        result = mca_checker_instance.check_name(name)
         results.append(result)
         time.sleep(0.1)
     
@@ -0,0 +1,224 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import requests
+import yaml
+
+# A rejected key pair stays parked this long, so a rotated key can recover
+# without restarting but a revoked one is not retried on every request
+AUTH_FAILURE_COOLDOWN = 3600.0
+
+AUTH_FAILURE_STATUSES = (401, 403)
+
+class QuotaExhaustedError(Exception):
+    """Raised when no pooled credential can take a request before the acquire timeout"""
+
+class FinanvoCredential:
+    """One Finanvo key pair with its observed quota, rate limit and AIMD concurrency window"""
+
+    def __init__(self, api_key: str, api_secret: str, label: str = None, max_window: float = 8.0):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.label = label or f"{api_key[:4]}..."
+        self.max_window = max_window
+        self.window = 1.0
+        self.in_flight = 0
+        self.limit = None
+        self.remaining = None
+        self.reset_at = 0.0
+        self.cooldown_until = 0.0
+        self.consecutive_throttles = 0
+        self.successes = 0
+        self.throttled = 0
+        self.auth_failures = 0
+
+    def headers(self) -> Dict[str, str]:
+        return {'x-api-key': self.api_key, 'x-api-secret-key': self.api_secret}
+
+    def available_at(self, now: float) -> float:
+        """Earliest time this credential may be used again (now if usable)"""
+        ready = self.cooldown_until
+        if self.remaining is not None and self.remaining <= 0:
+            ready = max(ready, self.reset_at)
+        return max(now, ready)
+
+    def has_slot(self, now: float) -> bool:
+        return self.available_at(now) <= now and self.in_flight < int(self.window)
+
+    def headroom(self) -> float:
+        """Preference score: free concurrency slots, scaled by the share of quota left"""
+        free_slots = int(self.window) - self.in_flight
+        if self.remaining is None or not self.limit:
+            return free_slots
+        return free_slots * (self.remaining / self.limit)
+
+    def on_success(self, window_full: bool):
+        self.successes += 1
+        self.consecutive_throttles = 0
+        # Only a request sent with the whole window in use shows the window can grow
+        if window_full:
+            self.window = min(self.max_window, self.window + 1.0 / self.window)
+
+    def on_throttle(self, now: float, retry_after: Optional[float]):
+        self.throttled += 1
+        self.consecutive_throttles += 1
+        self.window = max(1.0, self.window / 2)
+        backoff = retry_after if retry_after is not None else min(60.0, 2.0 ** self.consecutive_throttles)
+        self.cooldown_until = now + backoff
+
+    def on_auth_failure(self, now: float):
+        self.auth_failures += 1
+        self.cooldown_until = now + AUTH_FAILURE_COOLDOWN
+
+    def update_quota(self, headers, now: float):
+        limit = _header_number(headers, 'X-RateLimit-Limit')
+        remaining = _header_number(headers, 'X-RateLimit-Remaining')
+        reset = _header_number(headers, 'X-RateLimit-Reset')
+        if limit is not None:
+            self.limit = limit
+        if remaining is not None:
+            self.remaining = remaining
+        if reset is not None:
+            # Some APIs send an epoch timestamp, others seconds until reset
+            self.reset_at = reset if reset > 1e9 else now + reset
+
+    def stats(self) -> Dict:
+        return {
+            "label": self.label,
+            "window": round(self.window, 2),
+            "in_flight": self.in_flight,
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "successes": self.successes,
+            "throttled": self.throttled,
+            "auth_failures": self.auth_failures
+        }
+
+def _header_number(headers, name: str) -> Optional[float]:
+    value = headers.get(name) if headers else None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def load_credentials() -> List[FinanvoCredential]:
+    """
+    Load the credential pool from the environment.
+
+    FINANVO_CREDENTIALS holds "key:secret" pairs separated by commas,
+    FINANVO_CREDENTIALS_FILE points at a YAML/JSON list of {api_key, api_secret}
+    entries, and FINANVO_API_KEY / FINANVO_API_SECRET add a single pair. The
+    pool is empty when none of these are set.
+    """
+    entries = []
+
+    for pair in os.getenv('FINANVO_CREDENTIALS', '').split(','):
+        if ':' in pair:
+            api_key, api_secret = pair.strip().split(':', 1)
+            entries.append({"api_key": api_key, "api_secret": api_secret})
+
+    credentials_file = os.getenv('FINANVO_CREDENTIALS_FILE')
+    if credentials_file:
+        with open(credentials_file, 'r') as file:
+            entries.extend(yaml.safe_load(file) or [])
+
+    if os.getenv('FINANVO_API_KEY') and os.getenv('FINANVO_API_SECRET'):
+        entries.append({"api_key": os.getenv('FINANVO_API_KEY'), "api_secret": os.getenv('FINANVO_API_SECRET')})
+
+    unique = {entry["api_key"]: entry for entry in entries}
+    return [
+        FinanvoCredential(entry["api_key"], entry["api_secret"], entry.get("label"))
+        for entry in unique.values()
+    ]
+
+class FinanvoScheduler:
+    """
+    Spread Finanvo requests across a pool of credentials.
+
+    Each credential keeps an additive-increase / multiplicative-decrease
+    concurrency window: every success of a request sent while the window was
+    fully in use widens it by 1/window, every 429 halves
+    it and cools the credential down for Retry-After seconds. Quota headers
+    park a credential until its reset time once it runs dry, and a 401/403
+    parks it for AUTH_FAILURE_COOLDOWN seconds.
+    """
+
+    def __init__(self, credentials: List[FinanvoCredential] = None, acquire_timeout: float = 30.0, max_attempts: int = 3):
+        self.credentials = credentials if credentials is not None else load_credentials()
+        self.acquire_timeout = acquire_timeout
+        self.max_attempts = max_attempts
+        self._condition = threading.Condition()
+
+    def acquire(self) -> Tuple[FinanvoCredential, bool]:
+        """Take a slot on the best credential; also returns whether that filled its window"""
+        if not self.credentials:
+            raise QuotaExhaustedError("No Finanvo credentials configured (set FINANVO_API_KEY and FINANVO_API_SECRET)")
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._condition:
+            while True:
+                now = time.time()
+                ready = [c for c in self.credentials if c.has_slot(now)]
+                if ready:
+                    credential = max(ready, key=lambda c: c.headroom())
+                    credential.in_flight += 1
+                    return credential, credential.in_flight >= int(credential.window)
+
+                remaining = deadline - time.monotonic()
+                next_ready = min(c.available_at(now) for c in self.credentials) - now
+                if remaining <= 0 or next_ready > remaining:
+                    raise QuotaExhaustedError(
+                        f"All {len(self.credentials)} Finanvo credentials are rate limited, out of quota or rejected"
+                    )
+                # Either a cooldown ends or a release() notifies a freed slot
+                self._condition.wait(timeout=max(0.05, min(remaining, next_ready or remaining)))
+
+    def release(self, credential: FinanvoCredential, response: requests.Response = None, window_full: bool = False):
+        with self._condition:
+            now = time.time()
+            credential.in_flight -= 1
+            if response is not None:
+                credential.update_quota(response.headers, now)
+                if response.status_code == 429:
+                    credential.on_throttle(now, _header_number(response.headers, 'Retry-After'))
+                elif response.status_code in AUTH_FAILURE_STATUSES:
+                    credential.on_auth_failure(now)
+                elif response.status_code < 400:
+                    credential.on_success(window_full)
+            self._condition.notify_all()
+
+    def get(self, url: str, headers: Dict = None, **kwargs) -> requests.Response:
+        """GET through the pool, retrying throttled or rejected requests on another credential"""
+        response = None
+        for _ in range(self.max_attempts):
+            try:
+                credential, window_full = self.acquire()
+            except QuotaExhaustedError:
+                # Hand back the last refusal rather than hiding it behind the pool error
+                if response is not None:
+                    return response
+                raise
+            response = None
+            try:
+                response = requests.get(url, headers={**(headers or {}), **credential.headers()}, **kwargs)
+            finally:
+                self.release(credential, response, window_full)
+            if response.status_code != 429 and response.status_code not in AUTH_FAILURE_STATUSES:
+                return response
+        return response
+
+    def stats(self) -> List[Dict]:
+        with self._condition:
+            return [c.stats() for c in self.credentials]
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+def get_default_scheduler() -> FinanvoScheduler:
+    """Process-wide scheduler shared by every MCANameChecker"""
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = FinanvoScheduler()
+        return _default_scheduler
@@ -0,0 +1,93 @@
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+SUFFIXES = ['pvt ltd', 'private limited', 'ltd', 'limited', 'pvt', 'private']
+
+PROHIBITED_WORDS = [
+    'bank', 'banking', 'insurance', 'government', 'ministry', 'national',
+    'central', 'reserve', 'federal', 'authority', 'commission',
+    'corporation of india', 'registrar', 'co-operative', 'municipal',
+    'panchayat', 'king', 'queen', 'emperor', 'prince', 'princess',
+    'supreme', 'tribunal', 'court', 'university', 'college',
+    'trust', 'society', 'foundation', 'council'
+]
+
+VALID_SUFFIXES = [
+    'pvt ltd', 'private limited', 'pvt. ltd.', 'private limited.',
+    'limited', 'ltd', 'ltd.'
+]
+
+_INVALID_CHARS = re.compile(r'[^a-zA-Z0-9\s\.\-&()]')
+_MULTIPLE_SPACES = re.compile(r'\s{2,}')
+_STARTS_WITH_DIGIT = re.compile(r'\d')
+
+@lru_cache(maxsize=65536)
+def clean_company_name(name: str) -> str:
+    """Clean company name by removing suffixes and special characters (memoized, interned)"""
+    cleaned = name.lower()
+
+    for suffix in SUFFIXES:
+        if cleaned.endswith(suffix):
+            cleaned = cleaned[:-len(suffix)].strip()
+
+    cleaned = re.sub(r'[^a-zA-Z0-9\s]', '', cleaned)
+    return sys.intern(cleaned.strip())
+
+@lru_cache(maxsize=16384)
+def _validate_cached(name: str) -> Tuple[Tuple[str, ...], Tuple[str, ...], int]:
+    errors = []
+    warnings = []
+    if len(name) < 3:
+        errors.append("Company name too short (minimum 3 characters)")
+    elif len(name) > 120:
+        errors.append("Company name too long (maximum 120 characters)")
+
+    name_lower = name.lower()
+    for word in PROHIBITED_WORDS:
+        if word in name_lower:
+            errors.append(f"Prohibited word '{word}' found in name")
+
+    has_valid_suffix = any(name_lower.endswith(suffix) for suffix in VALID_SUFFIXES)
+    if not has_valid_suffix:
+        errors.append("Company name must end with proper suffix (Pvt Ltd or Private Limited)")
+    if _INVALID_CHARS.search(name):
+        errors.append("Invalid characters found (only letters, numbers, spaces, dots, hyphens, ampersands, and parentheses allowed)")
+    if _STARTS_WITH_DIGIT.match(name):
+        errors.append("Company name cannot start with a number")
+    if _MULTIPLE_SPACES.search(name):
+        warnings.append("Multiple consecutive spaces found")
+
+    if name != name.strip():
+        warnings.append("Leading or trailing spaces detected")
+    word_count = len(name.split())
+    if word_count > 15:
+        warnings.append("Very long names may face scrutiny during approval")
+
+    base_score = 100
+    base_score -= len(errors) * 25
+    base_score -= len(warnings) * 5
+    if has_valid_suffix:
+        base_score += 5
+    if 3 <= word_count <= 5:
+        base_score += 5
+    return tuple(errors), tuple(warnings), max(0, min(100, base_score))
+
+def _as_result(errors: Tuple[str, ...], warnings: Tuple[str, ...], score: int) -> Dict[str, Any]:
+    return {
+        "is_valid": len(errors) == 0,
+        "errors": list(errors),
+        "warnings": list(warnings),
+        "score": score
+    }
+
+def validate_naming_conventions(name: str) -> Dict[str, Any]:
+    """MCA naming-convention check, memoized per exact name; returns a fresh dict each call"""
+    return _as_result(*_validate_cached(name))
+
+def live_feedback(name: str) -> Dict[str, Any]:
+    """Validation plus cleaned form for the name field; both are memoized, so re-rendering the same input is a cache hit"""
+    result = validate_naming_conventions(name)
+    result["cleaned_name"] = clean_company_name(name)
+    return result
@@ -0,0 +1,135 @@
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Set, Tuple
+
+# Ordered rewrites folding common Indian transliteration variants onto one
+# spelling before consonant-skeleton encoding. Upper-case letters are
+# placeholders so later rules cannot rewrite them again.
+_REWRITES = [
+    (r"ksh|x", "KS"),
+    (r"qu", "KV"),
+    (r"ti(?=on)", "S"),
+    (r"chh?(?=[aeiouy])", "C"),
+    (r"ch", "K"),
+    (r"sh|z(?=h)", "S"),
+    (r"ph|f", "F"),
+    (r"(?<=[bdgjkpt])h", ""),
+    (r"ck|q|c(?![eiy])", "K"),
+    (r"c", "S"),
+    (r"w|v", "V"),
+    (r"z", "J"),
+    (r"ee|ii|y$", "i"),
+    (r"oo|uu|ou", "u"),
+    (r"aa", "a"),
+    (r"oe", "e"),
+    (r"(?<!^)h", ""),
+]
+_REWRITES = [(re.compile(pattern), replacement) for pattern, replacement in _REWRITES]
+
+_VOWELS = set("aeiouy")
+
+@lru_cache(maxsize=65536)
+def phonetic_key(token: str) -> str:
+    """
+    Encode one word as a sound-alike key tuned for transliterated Indian names.
+
+    Variants such as sh/s, v/w, ph/f, ksh/x, aspirated consonants (bh, dh, kh),
+    long vowels (ee, aa, oo) and a trailing schwa (shiva/shiv) fold together
+    and repeated sounds collapse, in the spirit of Soundex/Metaphone. Vowels
+    are kept after folding, so "sun", "sin" and "sana" stay apart.
+    """
+    word = re.sub(r"[^a-z]", "", token.lower())
+    if not word:
+        return ""
+    for pattern, replacement in _REWRITES:
+        word = pattern.sub(replacement, word)
+    word = word.lower()
+    if len(word) > 3 and word.endswith("a") and word[-2] not in _VOWELS:
+        word = word[:-1]
+
+    key = word[0]
+    for previous, ch in zip(word, word[1:]):
+        if ch != previous:
+            key += ch
+    return key
+
+def phonetic_keys(name: str) -> Tuple[str, ...]:
+    return tuple(key for key in (phonetic_key(token) for token in name.split()) if key)
+
+class PhoneticIndex:
+    """
+    Phonetic-key -> names index for "similar sounding" conflicts.
+
+    Every token of a registered name is indexed under its phonetic key. A query
+    costs one hash lookup per token; intersecting the posting sets (rarest
+    first) leaves the names containing a sound-alike of every query word.
+    Those with the same key sequence as the query are full matches; the rest
+    (extra or reordered words) are partial matches.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+        self._keys: List[Tuple[str, ...]] = []
+        self._names: List[str] = []
+        self._payloads: List[List[Any]] = []
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str, payload: Any = None):
+        keys = phonetic_keys(name)
+        if not keys:
+            return
+        with self._lock:
+            name_id = self._ids.get(name)
+            if name_id is None:
+                name_id = len(self._names)
+                self._ids[name] = name_id
+                self._names.append(name)
+                self._keys.append(keys)
+                self._payloads.append([])
+                for key in set(keys):
+                    self._postings.setdefault(key, set()).add(name_id)
+            if payload is not None:
+                self._payloads[name_id].append(payload)
+
+    def lookup(self, query: str, partial_limit: int = 5) -> List[Tuple[str, bool, List[Any]]]:
+        """
+        Return (name, full match, payloads) for indexed names that sound like ``query``.
+
+        Every full match is returned, followed by at most ``partial_limit``
+        partial matches, those with the fewest extra words first.
+        """
+        keys = phonetic_keys(query)
+        if not keys:
+            return []
+
+        postings = []
+        for key in set(keys):
+            ids = self._postings.get(key)
+            if not ids:
+                return []
+            postings.append(ids)
+        postings.sort(key=len)
+
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                return []
+
+        full = sorted(
+            (name_id for name_id in candidates if self._keys[name_id] == keys),
+            key=lambda name_id: self._names[name_id]
+        )
+        partial = sorted(
+            (name_id for name_id in candidates if self._keys[name_id] != keys),
+            key=lambda name_id: (len(self._keys[name_id]), self._names[name_id])
+        )[:partial_limit]
+        return (
+            [(self._names[name_id], True, list(self._payloads[name_id])) for name_id in full]
+            + [(self._names[name_id], False, list(self._payloads[name_id])) for name_id in partial]
+        )
@@ -0,0 +1,122 @@
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Callable, List, Optional
+
+class WarmBudget:
+    """
+    Token bucket capping speculative warm calls across every prefetcher.
+
+    Holds up to ``burst`` calls and refills at ``per_minute`` calls a minute,
+    so prefetching keeps working over a long-lived process while its API
+    usage stays bounded no matter how many sessions are typing.
+    """
+
+    def __init__(self, per_minute: float = 60.0, burst: int = 40):
+        self.per_minute = per_minute
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill_locked(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.per_minute / 60.0)
+        self._updated = now
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            self._refill_locked()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def refund(self):
+        with self._lock:
+            self._refill_locked()
+            self._tokens = min(self.burst, self._tokens + 1)
+
+class SpeculativePrefetcher:
+    """
+    Warm the name-check cache for the input being typed and its likely alternatives.
+
+    Each ``update`` with a new input starts a new generation: pending work from
+    older inputs is cancelled, and once the input has been stable for
+    ``settle_delay`` seconds the alternatives are generated and ``warm`` runs
+    for each name on ``executor``. The executor and ``budget`` are meant to be
+    shared process-wide, so per-session prefetchers own no threads of their own.
+    """
+
+    def __init__(self, warm: Callable[[str], None], generate: Callable[[str], List[str]],
+                 executor: Executor, budget: WarmBudget, settle_delay: float = 0.6):
+        self.warm = warm
+        self.generate = generate
+        self.executor = executor
+        self.budget = budget
+        self.settle_delay = settle_delay
+        self.current_input = None
+        self.include_alternatives = None
+        self._alternatives = None
+        self._generation = 0
+        self._timer: Optional[threading.Timer] = None
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+
+    def update(self, text: str, include_alternatives: bool = True):
+        """Record the latest input; cheap enough to call on every Streamlit rerun"""
+        text = (text or "").strip()
+        with self._lock:
+            if text == self.current_input and include_alternatives == self.include_alternatives:
+                return
+            self._cancel_locked()
+            self.current_input = text
+            self.include_alternatives = include_alternatives
+            self._alternatives = None
+            if len(text) < 3:
+                return
+            generation = self._generation
+            self._timer = threading.Timer(
+                self.settle_delay, self._start, args=(generation, text, include_alternatives)
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def alternatives_for(self, text: str) -> Optional[List[str]]:
+        """Alternatives already generated (and being warmed) for ``text``, if any"""
+        with self._lock:
+            if (text or "").strip() == self.current_input and self._alternatives:
+                return list(self._alternatives)
+            return None
+
+    def _cancel_locked(self):
+        self._generation += 1
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for future in self._futures:
+            if future.cancel():
+                self.budget.refund()
+        self._futures = []
+
+    def _start(self, generation: int, text: str, include_alternatives: bool):
+        alternatives = self.generate(text) if include_alternatives else []
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._alternatives = alternatives
+            for name in [text] + alternatives:
+                if not self.budget.try_spend():
+                    break
+                self._futures.append(self.executor.submit(self._warm, generation, name))
+
+    def _warm(self, generation: int, name: str):
+        # Work that was already running when the input changed stops here
+        if generation != self._generation:
+            return
+        self.warm(name)
+
+    def cancel(self):
+        """Drop pending work; the shared executor keeps running for other sessions"""
+        with self._lock:
+            self._cancel_locked()
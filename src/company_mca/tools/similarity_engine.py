@@ -0,0 +1,169 @@
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+class NGramSimilarityEngine:
+    """
+    Character n-gram TF-IDF index for ranking whole batches of names at once.
+
+    Names become L2-normalised sparse TF-IDF rows, so cosine similarity against
+    the whole index is one sparse matrix product per batch instead of a
+    pairwise fuzz.ratio loop. Rows can be added at any time: new rows are
+    weighted with the current IDF and the full matrix is only re-weighted once
+    the corpus has grown by ``refresh_ratio`` since the last rebuild.
+    """
+
+    def __init__(self, ngram_range: Tuple[int, int] = (2, 3), refresh_ratio: float = 0.2):
+        self.ngram_range = ngram_range
+        self.refresh_ratio = refresh_ratio
+        self._vocabulary: Dict[str, int] = {}
+        self._document_frequency = np.zeros(0, dtype=np.int64)
+        self._names: List[str] = []
+        self._payloads: List[List[Any]] = []
+        self._ids: Dict[str, int] = {}
+        self._pending: List[sparse.csr_matrix] = []
+        self._raw_counts = None
+        self._weighted = None
+        self._weighted_t = None
+        self._idf = None
+        self._built_rows = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def _ngrams(self, name: str) -> List[str]:
+        padded = f" {name} "
+        low, high = self.ngram_range
+        return [
+            padded[i:i + n]
+            for n in range(low, high + 1)
+            for i in range(len(padded) - n + 1)
+        ]
+
+    def _count_rows(self, names: List[str], grow: bool) -> sparse.csr_matrix:
+        """Raw n-gram counts, adding unseen n-grams to the vocabulary when ``grow`` is set"""
+        indptr, indices, data = [0], [], []
+        for name in names:
+            counts = {}
+            for gram in self._ngrams(name):
+                column = self._vocabulary.get(gram)
+                if column is None:
+                    if not grow:
+                        continue
+                    column = self._vocabulary[gram] = len(self._vocabulary)
+                counts[column] = counts.get(column, 0) + 1
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.array(data, dtype=np.float64), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(names), len(self._vocabulary))
+        )
+
+    def add_many(self, items: Iterable[Tuple[str, Any]]):
+        """Index (name, payload) pairs; repeated names only gain the extra payload"""
+        with self._lock:
+            new_names = []
+            for name, payload in items:
+                if not name:
+                    continue
+                name_id = self._ids.get(name)
+                if name_id is None:
+                    name_id = self._ids[name] = len(self._names)
+                    self._names.append(name)
+                    self._payloads.append([])
+                    new_names.append(name)
+                if payload is not None:
+                    self._payloads[name_id].append(payload)
+            if not new_names:
+                return
+
+            counts = self._count_rows(new_names, grow=True)
+            document_frequency = np.zeros(len(self._vocabulary), dtype=np.int64)
+            document_frequency[:len(self._document_frequency)] = self._document_frequency
+            document_frequency += np.bincount(counts.indices, minlength=len(self._vocabulary))
+            self._document_frequency = document_frequency
+            self._pending.append(counts)
+
+    def add(self, name: str, payload: Any = None):
+        self.add_many([(name, payload)])
+
+    def _resized(self, matrix: sparse.csr_matrix, columns: int) -> sparse.csr_matrix:
+        matrix = matrix.copy()
+        matrix.resize((matrix.shape[0], columns))
+        return matrix
+
+    def _weigh(self, counts: sparse.csr_matrix) -> sparse.csr_matrix:
+        weighted = sparse.csr_matrix(self._resized(counts, len(self._idf)).multiply(self._idf))
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.csr_matrix(sparse.diags(1.0 / norms) @ weighted)
+
+    def _matrix(self) -> sparse.csr_matrix:
+        """
+        Transposed weighted index (n-grams x names) in CSR form, folding in rows
+        added since the last call. Keeping the transpose in CSR avoids a full
+        CSC -> CSR conversion inside every query product.
+        """
+        if not self._pending:
+            return self._weighted_t
+
+        columns = len(self._vocabulary)
+        pending = sparse.vstack([self._resized(m, columns) for m in self._pending], format="csr")
+        self._pending = []
+        total = len(self._names)
+        if self._raw_counts is None:
+            self._raw_counts = pending
+        else:
+            self._raw_counts = sparse.vstack([self._resized(self._raw_counts, columns), pending], format="csr")
+
+        if self._weighted is None or total - self._built_rows > self.refresh_ratio * self._built_rows:
+            self._idf = np.log((1 + total) / (1 + self._document_frequency)) + 1.0
+            self._weighted = self._weigh(self._raw_counts)
+            self._built_rows = total
+        else:
+            # Keep the existing IDF for known n-grams and only weight the new rows
+            new_columns = self._document_frequency[len(self._idf):]
+            self._idf = np.concatenate([self._idf, np.log((1 + total) / (1 + new_columns)) + 1.0])
+            self._weighted = sparse.vstack(
+                [self._resized(self._weighted, columns), self._weigh(pending)], format="csr"
+            )
+        self._weighted_t = self._weighted.T.tocsr()
+        return self._weighted_t
+
+    def top_k(self, queries: List[str], k: int = 5, min_score: float = 0.0,
+              chunk_size: int = 1024) -> List[List[Tuple[str, float, List[Any]]]]:
+        """
+        Return the ``k`` most similar indexed names for every query.
+
+        Each result is a list of (name, cosine similarity, payloads), best first.
+        Queries are scored in chunks so the similarity matrix stays bounded.
+        """
+        if not queries:
+            return []
+        with self._lock:
+            matrix = self._matrix()
+            if matrix is None:
+                return [[] for _ in queries]
+            encoded = self._weigh(self._count_rows(queries, grow=False))
+            names, payloads = self._names, self._payloads
+
+        results = []
+        for start in range(0, len(queries), chunk_size):
+            scores = sparse.csr_matrix(encoded[start:start + chunk_size] @ matrix)
+            for row in range(scores.shape[0]):
+                begin, end = scores.indptr[row], scores.indptr[row + 1]
+                data, columns = scores.data[begin:end], scores.indices[begin:end]
+                if len(data) > k:
+                    keep = np.argpartition(-data, k)[:k]
+                    data, columns = data[keep], columns[keep]
+                order = np.argsort(-data, kind="stable")
+                results.append([
+                    (names[column], float(data[i]), list(payloads[column]))
+                    for i, column in zip(order, columns[order])
+                    if data[i] >= min_score
+                ])
+        return results
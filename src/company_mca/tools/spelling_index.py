@@ -0,0 +1,123 @@
+import threading
+from typing import Any, Dict, List, Set, Tuple
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """All strings reachable from ``word`` by removing up to ``max_distance`` characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {
+            candidate[:i] + candidate[i + 1:]
+            for candidate in frontier
+            for i in range(len(candidate))
+        }
+        results |= frontier
+    return results
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Optimal string alignment distance, or max_distance + 1 once the bound is exceeded"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return previous[-1] if previous[-1] <= max_distance else max_distance + 1
+
+class DeletionIndex:
+    """
+    SymSpell-style index returning every indexed name within a small edit distance.
+
+    The deletion neighbourhood is built per distinct word rather than per name,
+    so a handful of dictionary lookups finds the words within the distance of
+    each query word. A name within the distance of the query must contain a
+    close word for every query word, so candidates start from the rarest query
+    word and are narrowed by the others before the bounded edit distance is
+    verified; a common first word such as "global" or "shree" no longer pulls
+    in every name that starts with it. Edits that merge or split words are
+    left to the n-gram similarity engine.
+    """
+
+    def __init__(self, max_distance: int = 2):
+        self.max_distance = max_distance
+        self._deletes: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._names: List[str] = []
+        self._tokens: List[frozenset] = []
+        self._payloads: List[List[Any]] = []
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, name: str, payload: Any = None):
+        tokens = frozenset(name.split())
+        if not tokens:
+            return
+        with self._lock:
+            name_id = self._ids.get(name)
+            if name_id is None:
+                name_id = len(self._names)
+                self._ids[name] = name_id
+                self._names.append(name)
+                self._tokens.append(tokens)
+                self._payloads.append([])
+                for token in tokens:
+                    postings = self._postings.get(token)
+                    if postings is None:
+                        postings = self._postings[token] = set()
+                        for key in _deletes(token, self.max_distance):
+                            self._deletes.setdefault(key, set()).add(token)
+                    postings.add(name_id)
+            if payload is not None:
+                self._payloads[name_id].append(payload)
+
+    def _close_tokens(self, token: str, max_distance: int) -> Set[str]:
+        close = set()
+        for key in _deletes(token, max_distance):
+            close.update(self._deletes.get(key, ()))
+        return {word for word in close if edit_distance(token, word, max_distance) <= max_distance}
+
+    def lookup(self, query: str, max_distance: int = None) -> List[Tuple[str, int, List[Any]]]:
+        """Return (name, distance, payloads) for indexed names within max_distance, closest first"""
+        tokens = set(query.split())
+        if not tokens:
+            return []
+        max_distance = min(self.max_distance, self.max_distance if max_distance is None else max_distance)
+
+        with self._lock:
+            close = []
+            for token in tokens:
+                words = self._close_tokens(token, max_distance)
+                if not words:
+                    return []
+                close.append((sum(len(self._postings[word]) for word in words), words))
+            close.sort(key=lambda entry: entry[0])
+
+            candidates = set()
+            for word in close[0][1]:
+                candidates |= self._postings[word]
+            for _, words in close[1:]:
+                candidates = {name_id for name_id in candidates if not words.isdisjoint(self._tokens[name_id])}
+                if not candidates:
+                    return []
+
+            matches = []
+            for name_id in candidates:
+                name = self._names[name_id]
+                distance = edit_distance(query, name, max_distance)
+                if distance <= max_distance:
+                    matches.append((name, distance, list(self._payloads[name_id])))
+
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
@@ -0,0 +1,296 @@
+import math
+import os
+from math import gcd
+import sys
+import threading
+import time
+from array import array
+from collections import Counter
+from typing import Dict, Iterator, List
+
+from fuzzywuzzy import fuzz
+
+BUSINESS_WORDS = [
+    "solutions", "systems", "services", "technologies", "enterprises",
+    "consulting", "digital", "software", "innovations", "labs",
+    "ventures", "industries", "corporation", "holdings", "group"
+]
+
+LOCATIONS = ["Delhi", "Mumbai", "Bangalore", "Chennai", "Hyderabad", "Pune"]
+
+LOCATION_STATES = {
+    "Delhi": "DL", "Mumbai": "MH", "Bangalore": "KA",
+    "Chennai": "TN", "Hyderabad": "TG", "Pune": "MH"
+}
+
+COMMON_BASE_WORDS = [
+    "tech", "data", "cloud", "cyber", "smart", "prime", "elite", "neo", "pro", "meta",
+    "apex", "alpha", "nova", "star", "sun", "green", "blue", "bright", "future", "infinity",
+    "bharat", "indus", "ganga", "himalaya", "sri", "shree", "om", "sai", "lakshmi", "ganesh",
+    "krishna", "shiva", "surya", "agni", "vayu", "akash", "jai", "navya", "aarav", "vihaan",
+    "quantum", "vertex", "pinnacle", "summit", "fusion", "matrix", "vision", "zenith", "orbit", "pixel"
+]
+
+SYLLABLES = ["ra", "vi", "ka", "sha", "ni", "tri", "ve", "dha", "ma", "lo", "su", "an", "ja", "pra", "ki"]
+
+# Two and three syllable brand coinages widen the vocabulary to ~3,500 words
+BASE_WORDS = COMMON_BASE_WORDS + [a + b for a in SYLLABLES for b in SYLLABLES] + [
+    a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES if a != c
+]
+
+PATTERNS = [
+    "{base} {business} Private Limited",
+    "{base} {business} Pvt Ltd",
+    "New {base} {business} Limited",
+    "{base} {location} {business} Pvt Ltd",
+    "Global {base} {business} Private Limited",
+    "{base} {second} {business} Private Limited"
+]
+
+# Name families: the pattern variants a family may use (which differ only in
+# their legal suffix, so they clean to the same name) and the word lists it
+# combines. Every combination within a family is a distinct cleaned name.
+FAMILIES = [
+    ((0, 1), ("base", "business")),
+    ((2,), ("base", "business")),
+    ((3,), ("base", "location", "business")),
+    ((4,), ("base", "business")),
+    ((5,), ("base", "second", "business")),
+]
+
+WORD_LISTS = {
+    "base": BASE_WORDS,
+    "second": BASE_WORDS,
+    "business": BUSINESS_WORDS,
+    "location": LOCATIONS
+}
+
+FAMILY_CAPACITIES = [math.prod(len(WORD_LISTS[field]) for field in fields) for _, fields in FAMILIES]
+
+def _allocation_phases() -> List[tuple]:
+    """
+    (first index, ordinals already used, families) for each phase of dealing
+    indexes round-robin across the families; a phase ends when its smallest
+    family is used up, and the rest carry on in the next one.
+    """
+    phases = []
+    families = list(range(len(FAMILIES)))
+    offset = used = 0
+    while families:
+        step = min(FAMILY_CAPACITIES[family] for family in families) - used
+        phases.append((offset, used, families))
+        offset += step * len(families)
+        used += step
+        families = [family for family in families if FAMILY_CAPACITIES[family] > used]
+    return phases
+
+ALLOCATION_PHASES = _allocation_phases()
+
+SUFFIX_WORDS = {"pvt", "ltd", "private", "limited"}
+
+STATUSES = ["Active"] * 14 + ["Inactive"] * 3 + ["Struck Off"] * 3
+
+_MASK = (1 << 64) - 1
+
+def _mix(value: int) -> int:
+    """splitmix64 finaliser: stable across platforms and Python versions, unlike hash()"""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+def _query_tokens(name: str) -> List[str]:
+    cleaned = "".join(ch if ch.isalnum() else " " for ch in name.lower())
+    return [token for token in cleaned.split() if token not in SUFFIX_WORDS]
+
+class SyntheticRegistry:
+    """
+    Seeded, synthetic stand-in for the MCA register.
+
+    Record ``i`` is a pure function of ``(seed, i)``, so the corpus never has to
+    be stored: only a token -> record-id inverted index is kept, which makes
+    millions of names practical. The same query against the same seed and size
+    always returns the same companies in the same order.
+    """
+
+    def __init__(self, size: int = 100_000, seed: int = 42, max_scan: int = 20_000, rerank: int = 200):
+        capacity = sum(FAMILY_CAPACITIES)
+        if size > capacity:
+            raise ValueError(f"Synthetic registry holds at most {capacity:,} unique names")
+        self.size = size
+        self.seed = seed
+        self.max_scan = max_scan
+        self.rerank = rerank
+        self._postings = None
+        self._build_lock = threading.Lock()
+        self._permutations = [self._permutation(family) for family in range(len(FAMILIES))]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _permutation(self, family: int) -> tuple:
+        """Seeded affine bijection over a family's combinations, so neighbouring records differ"""
+        capacity = FAMILY_CAPACITIES[family]
+        key = _mix((self.seed << 8) ^ family)
+        multiplier = key % capacity | 1
+        while gcd(multiplier, capacity) != 1:
+            multiplier += 2
+        return multiplier, (key >> 32) % capacity
+
+    def _allocate(self, index: int) -> tuple:
+        """Map a record index one-to-one onto (family, combination)"""
+        for offset, used, families in reversed(ALLOCATION_PHASES):
+            if index >= offset:
+                break
+        position = index - offset
+        family = families[position % len(families)]
+        multiplier, shift = self._permutations[family]
+        return family, (multiplier * (used + position // len(families)) + shift) % FAMILY_CAPACITIES[family]
+
+    def _fields(self, index: int) -> Dict[str, str]:
+        name_bits = _mix((self.seed << 32) ^ index)
+        cin_bits = _mix(name_bits)
+
+        family, combination = self._allocate(index)
+        variants, fields = FAMILIES[family]
+        choice = {"base": 0, "second": 0, "business": 0, "location": 0}
+        for field in fields:
+            combination, choice[field] = divmod(combination, len(WORD_LISTS[field]))
+        pattern = variants[name_bits % len(variants)]
+        base, second, business, location = choice["base"], choice["second"], choice["business"], choice["location"]
+
+        cin_bits, status = divmod(cin_bits, len(STATUSES))
+        cin_bits, nic = divmod(cin_bits, 90000)
+        cin_bits, year = divmod(cin_bits, 14)
+
+        return {
+            "pattern": PATTERNS[pattern],
+            "base": BASE_WORDS[base],
+            "second": BASE_WORDS[second],
+            "business": BUSINESS_WORDS[business],
+            "location": LOCATIONS[location],
+            "status": STATUSES[status],
+            "nic": str(10000 + nic),
+            "year": str(2010 + year)
+        }
+
+    def _tokens(self, fields: Dict[str, str]) -> List[str]:
+        pattern = fields["pattern"]
+        tokens = [fields["base"], fields["business"]]
+        if "{second}" in pattern:
+            tokens.append(fields["second"])
+        if "{location}" in pattern:
+            tokens.append(fields["location"].lower())
+        if pattern.startswith("New "):
+            tokens.append("new")
+        elif pattern.startswith("Global "):
+            tokens.append("global")
+        return tokens
+
+    def record(self, index: int) -> Dict[str, str]:
+        fields = self._fields(index)
+        company_name = fields["pattern"].format(
+            base=fields["base"].title(),
+            second=fields["second"].title(),
+            business=fields["business"].title(),
+            location=fields["location"]
+        )
+        state = LOCATION_STATES[fields["location"]]
+        return {
+            "company_name": company_name,
+            "cin": f"U{fields['nic']}{state}{fields['year']}PTC{index % 1_000_000:06d}",
+            "status": fields["status"]
+        }
+
+    def records(self, start: int = 0, stop: int = None) -> Iterator[Dict[str, str]]:
+        for index in range(start, min(stop or self.size, self.size)):
+            yield self.record(index)
+
+    def _ensure_index(self) -> Dict[str, array]:
+        with self._build_lock:
+            if self._postings is None:
+                postings = {}
+                for index in range(self.size):
+                    for token in self._tokens(self._fields(index)):
+                        ids = postings.get(token)
+                        if ids is None:
+                            ids = postings[token] = array('I')
+                        ids.append(index)
+                self._postings = postings
+            return self._postings
+
+    def search(self, name: str, limit: int = 10) -> List[Dict]:
+        """
+        Return registered companies sharing words with ``name``, most similar first.
+
+        Rarest tokens are scanned first and at most ``max_scan`` postings are
+        read, so very common words such as "solutions" cannot blow up latency.
+        """
+        postings = self._ensure_index()
+        tokens = [t for t in dict.fromkeys(_query_tokens(name)) if t in postings]
+        if not tokens:
+            return []
+
+        # Candidates are weighted by token rarity (IDF) so records sharing a
+        # distinctive word outrank those sharing only a generic business word
+        shared = Counter()
+        scanned = 0
+        for token in sorted(tokens, key=lambda t: len(postings[t])):
+            ids = postings[token]
+            if scanned and scanned + len(ids) > self.max_scan:
+                break
+            weight = math.log(self.size / len(ids)) + 1
+            for index in ids[:self.max_scan]:
+                shared[index] += weight
+            scanned += len(ids)
+
+        query = " ".join(_query_tokens(name))
+        candidates = sorted(shared.items(), key=lambda item: (-item[1], item[0]))[:self.rerank]
+        matches = []
+        for index, _ in candidates:
+            company = self.record(index)
+            similarity = fuzz.ratio(query, " ".join(_query_tokens(company["company_name"])))
+            if similarity > 30:
+                company["similarity"] = similarity
+                company["registry_id"] = index
+                matches.append(company)
+
+        matches.sort(key=lambda company: (-company["similarity"], company["registry_id"]))
+        return matches[:limit]
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+def get_default_registry() -> SyntheticRegistry:
+    """Shared registry sized by MCA_REGISTRY_SIZE and seeded by MCA_REGISTRY_SEED"""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = SyntheticRegistry(
+                size=int(os.getenv('MCA_REGISTRY_SIZE', '100000')),
+                seed=int(os.getenv('MCA_REGISTRY_SEED', '42'))
+            )
+        return _default_registry
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python -m src.company_mca.tools.synthetic_registry 'Company Name' [size] [seed]")
+        sys.exit(1)
+
+    registry = SyntheticRegistry(
+        size=int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000,
+        seed=int(sys.argv[3]) if len(sys.argv) > 3 else 42
+    )
+
+    start = time.perf_counter()
+    registry.search("warm up")
+    print(f"Indexed {len(registry):,} names in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    matches = registry.search(sys.argv[1])
+    print(f"Search took {(time.perf_counter() - start) * 1000:.1f}ms")
+    for company in matches:
+        print(f"{company['similarity']:>3}  {company['company_name']}  {company['cin']}  {company['status']}")
+
+if __name__ == "__main__":
+    main()